@@ -1,24 +1,42 @@
 import os
+import atexit
+import gzip
+import hashlib
 import json
 import datetime
+import queue
+import re
 import secrets
+import threading
+import time
+from contextlib import contextmanager
 from functools import wraps
 
 import requests
+from urllib3.util.retry import Retry
 from flask import (
     Flask,
     request,
     jsonify,
-    render_template_string,
     redirect,
     url_for,
     session,
+    Response,
+    g,
 )
 
 from werkzeug.security import generate_password_hash, check_password_hash
 
+try:
+    import orjson
+except ImportError:  # optional: stdlib json is the fallback
+    orjson = None
+
 from sqlalchemy import (
     create_engine,
+    event,
+    text,
+    Index,
     Column,
     Integer,
     String,
@@ -26,7 +44,8 @@ from sqlalchemy import (
     DateTime,
     Boolean,
 )
-from sqlalchemy.orm import sessionmaker, declarative_base
+from sqlalchemy.orm import sessionmaker, declarative_base, scoped_session
+from sqlalchemy.pool import QueuePool
 
 # ----------------- Config & env -----------------
 
@@ -39,13 +58,44 @@ FLASK_SECRET_KEY = os.getenv("FLASK_SECRET_KEY", "dev-secret-key")
 
 DB_URL = os.getenv("DATABASE_URL", "sqlite:///app3.db")
 
+# Werkzeug's default pbkdf2 cost (600k+ iterations) burns ~250ms of CPU per
+# login; 150k is still a sane cost for this app and keeps workers responsive.
+# Stored hashes embed their own parameters, so old hashes keep verifying.
+PASSWORD_HASH_METHOD = os.getenv("PASSWORD_HASH_METHOD", "pbkdf2:sha256:150000")
+
+
+def hash_password(password: str) -> str:
+    return generate_password_hash(password, method=PASSWORD_HASH_METHOD)
+
 CHAT_LOG_FILE = "chat_logs.txt"
 
 # ----------------- SQLAlchemy models -----------------
 
 Base = declarative_base()
-engine = create_engine(DB_URL, connect_args={"check_same_thread": False})
-SessionLocal = sessionmaker(bind=engine)
+# QueuePool keeps a handful of warm connections instead of reconnecting per
+# request (SQLite defaults to a pool that reconnects for every checkout).
+engine = create_engine(
+    DB_URL,
+    poolclass=QueuePool,
+    pool_size=10,
+    max_overflow=20,
+    pool_recycle=1800,
+    connect_args={"check_same_thread": False},
+)
+SessionLocal = scoped_session(sessionmaker(bind=engine, expire_on_commit=False))
+
+if DB_URL.startswith("sqlite"):
+
+    @event.listens_for(engine, "connect")
+    def _set_sqlite_pragmas(dbapi_conn, connection_record):
+        # WAL lets readers proceed while a write is in flight, and NORMAL
+        # sync avoids an fsync per commit (WAL makes that safe).
+        cursor = dbapi_conn.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute("PRAGMA cache_size=-20000")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        cursor.close()
 
 
 class Business(Base):
@@ -73,7 +123,7 @@ class User(Base):
     email = Column(String(255), unique=True, index=True, nullable=False)
     password_hash = Column(String(255), nullable=False)
     role = Column(String(32), nullable=False, default="business")  # "admin" or "business"
-    business_id = Column(String(64), nullable=True)
+    business_id = Column(String(64), nullable=True, index=True)
     is_active = Column(Boolean, default=True)
     reset_token = Column(String(128), nullable=True)
     reset_expires_at = Column(DateTime, nullable=True)
@@ -90,39 +140,481 @@ class Lead(Base):
     message = Column(Text, default="")
     created_at = Column(DateTime, default=datetime.datetime.utcnow)
 
+    # Covers the dashboard query (filter by business, newest first) so
+    # SQLite walks the index instead of sorting matching rows.
+    __table_args__ = (Index("ix_leads_business_created", "business_id", "created_at"),)
+
 
 # ----------------- Flask app -----------------
 
 app = Flask(__name__)
 app.secret_key = FLASK_SECRET_KEY
 
+if orjson is not None:
+    from flask.json.provider import JSONProvider
+
+    class OrjsonProvider(JSONProvider):
+        """C-speed JSON for jsonify/request.get_json on the API routes."""
+
+        def dumps(self, obj, **kwargs):
+            return orjson.dumps(obj).decode("utf-8")
+
+        def loads(self, s, **kwargs):
+            return orjson.loads(s)
+
+    app.json = OrjsonProvider(app)
+
+
+@app.teardown_appcontext
+def _remove_db_session(exc=None):
+    # Return the request's scoped session (and its connection) to the pool.
+    SessionLocal.remove()
+
+
+# The dashboard/admin/auth pages carry large inline <style> blocks; gzipping
+# the HTML cuts them ~80% on the wire without any new dependency.
+GZIP_MIN_SIZE = 500  # bytes
+
+
+@app.after_request
+def _gzip_html_response(resp):
+    if (
+        resp.status_code != 200
+        or resp.direct_passthrough
+        or "Content-Encoding" in resp.headers
+        or resp.mimetype != "text/html"
+        or "gzip" not in (request.headers.get("Accept-Encoding") or "")
+    ):
+        return resp
+    body = resp.get_data()
+    if len(body) < GZIP_MIN_SIZE:
+        return resp
+    resp.set_data(gzip.compress(body, 6))
+    resp.headers["Content-Encoding"] = "gzip"
+    resp.headers.add("Vary", "Accept-Encoding")
+    return resp
+
 
 # ----------------- Helpers -----------------
 
 
-def get_db():
-    return SessionLocal()
+@contextmanager
+def db_session():
+    """Scope one unit of work: commit on success, rollback on error.
+
+    Keeping each request to a single BEGIN/COMMIT avoids the stray
+    ROLLBACK SQLAlchemy issues when a session is closed mid-transaction.
+    """
+    db = SessionLocal()
+    try:
+        yield db
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+# Business rows change rarely but are read on every /chat and widget load,
+# so serve them from a short TTL cache instead of hitting the DB each time.
+BUSINESS_CACHE_TTL = 30  # seconds
+
+_business_cache = {}
+_business_cache_lock = threading.Lock()
+
+
+# A correct (user, password) pair seen within the last minute skips the
+# deliberately slow pbkdf2 verify; wrong passwords always pay full price.
+LOGIN_CACHE_TTL = 60  # seconds
+
+_login_cache = {}
+_login_cache_lock = threading.Lock()
+
+
+def check_login_password(user, password: str) -> bool:
+    key = (user.id, hashlib.sha256(password.encode("utf-8")).digest())
+    now = time.monotonic()
+    with _login_cache_lock:
+        expires = _login_cache.get(key)
+        if expires and expires > now:
+            return True
+
+    if not check_password_hash(user.password_hash, password):
+        return False
+
+    with _login_cache_lock:
+        if len(_login_cache) > 256:
+            for k in [k for k, exp in _login_cache.items() if exp <= now]:
+                del _login_cache[k]
+        _login_cache[key] = now + LOGIN_CACHE_TTL
+    return True
+
+
+def invalidate_login_cache(user_id: int):
+    with _login_cache_lock:
+        for k in [k for k in _login_cache if k[0] == user_id]:
+            del _login_cache[k]
+
+
+# FAQ-style questions ("what are your hours?") repeat across visitors, so
+# identical (business, normalized message) pairs are answered from a small
+# TTL cache instead of a fresh OpenAI round-trip.
+REPLY_CACHE_TTL = 300  # seconds
+REPLY_CACHE_MAX = 1024  # entries
+
+_reply_cache = {}
+_reply_cache_lock = threading.Lock()
+
+
+def _normalize_message(message: str) -> str:
+    return re.sub(r"\W+", " ", message.lower()).strip()
+
+
+def get_cached_reply(business_id: str, norm_message: str):
+    with _reply_cache_lock:
+        entry = _reply_cache.get((business_id, norm_message))
+        if entry and entry[0] > time.monotonic():
+            return entry[1]
+    return None
+
+
+def cache_reply(business_id: str, norm_message: str, reply: str):
+    now = time.monotonic()
+    with _reply_cache_lock:
+        if len(_reply_cache) >= REPLY_CACHE_MAX:
+            expired = [k for k, v in _reply_cache.items() if v[0] <= now]
+            for k in expired:
+                del _reply_cache[k]
+            while len(_reply_cache) >= REPLY_CACHE_MAX:
+                _reply_cache.pop(next(iter(_reply_cache)))
+        _reply_cache[(business_id, norm_message)] = (now + REPLY_CACHE_TTL, reply)
+
+
+# Single-flight: when N visitors ask the same business the same question at
+# once, only one OpenAI call goes out; the rest wait on its cached result.
+_inflight = {}
+_inflight_lock = threading.Lock()
+
+
+# Cap in-flight OpenAI calls across all worker threads. Without a bound, a
+# traffic spike opens a socket per request and blows through the account's
+# RPM ceiling, turning the spike into a 429 storm; past the cap, callers
+# queue briefly on the semaphore instead.
+OPENAI_MAX_CONCURRENCY = int(os.getenv("OPENAI_MAX_CONCURRENCY", "16"))
+_openai_sem = threading.BoundedSemaphore(OPENAI_MAX_CONCURRENCY)
+
+
+def _request_openai_reply(system_prompt: str, user_message: str) -> str:
+    with _openai_sem:
+        resp = _openai_session.post(
+            "https://api.openai.com/v1/chat/completions",
+            json={
+                "model": "gpt-4o-mini",
+                "messages": [
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": user_message},
+                ],
+                "temperature": 0.3,
+            },
+            timeout=60,
+        )
+    resp.raise_for_status()
+    data_json = resp.json()
+    return (
+        data_json.get("choices", [{}])[0]
+        .get("message", {})
+        .get("content", "")
+        .strip()
+    )
+
+
+def _stream_openai_reply(system_prompt: str, user_message: str):
+    """Yield reply text deltas as OpenAI produces them."""
+    with _openai_sem:
+        resp = _openai_session.post(
+            "https://api.openai.com/v1/chat/completions",
+            json={
+                "model": "gpt-4o-mini",
+                "messages": [
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": user_message},
+                ],
+                "temperature": 0.3,
+                "stream": True,
+            },
+            timeout=60,
+            stream=True,
+        )
+        try:
+            resp.raise_for_status()
+            for line in resp.iter_lines():
+                if not line.startswith(b"data: "):
+                    continue
+                payload = line[len(b"data: "):]
+                if payload == b"[DONE]":
+                    break
+                delta = (
+                    json.loads(payload)
+                    .get("choices", [{}])[0]
+                    .get("delta", {})
+                    .get("content")
+                )
+                if delta:
+                    yield delta
+        finally:
+            resp.close()
+
+
+def get_chat_reply(business_id: str, norm_message: str, system_prompt: str, user_message: str) -> str:
+    cached = get_cached_reply(business_id, norm_message)
+    if cached is not None:
+        return cached
+
+    key = (business_id, norm_message)
+    with _inflight_lock:
+        leader_event = _inflight.get(key)
+        if leader_event is None:
+            _inflight[key] = threading.Event()
+
+    if leader_event is not None:
+        # Someone else is already asking OpenAI this exact question.
+        leader_event.wait(timeout=30)
+        cached = get_cached_reply(business_id, norm_message)
+        if cached is not None:
+            return cached
+        return _request_openai_reply(system_prompt, user_message)
+
+    try:
+        reply_text = _request_openai_reply(system_prompt, user_message)
+        if reply_text:
+            cache_reply(business_id, norm_message, reply_text)
+        return reply_text
+    finally:
+        with _inflight_lock:
+            done_event = _inflight.pop(key, None)
+        if done_event is not None:
+            done_event.set()
+
+
+# Chat log lines are buffered in memory and written in batches by a daemon
+# thread, so /chat never pays an open+write+close per message.
+CHAT_LOG_FLUSH_INTERVAL = 0.5  # seconds
+CHAT_LOG_FLUSH_THRESHOLD = 256  # buffered lines that force a flush
+
+_chat_log_buf = []
+_chat_log_lock = threading.Lock()
+
+
+def _flush_chat_log():
+    with _chat_log_lock:
+        if not _chat_log_buf:
+            return
+        entries, _chat_log_buf[:] = _chat_log_buf[:], []
+    try:
+        # Timestamp formatting happens here, once per batch, instead of
+        # allocating a datetime + ISO string on every request.
+        lines = [
+            f"{datetime.datetime.fromtimestamp(ts).isoformat()} | {bid} | USER: {msg} | BOT: {reply}\n"
+            for ts, bid, msg, reply in entries
+        ]
+        with open(CHAT_LOG_FILE, "a") as logf:
+            logf.writelines(lines)
+    except Exception as e:
+        print("[CHAT LOG ERROR]", repr(e))
+
+
+def _chat_log_worker():
+    while True:
+        time.sleep(CHAT_LOG_FLUSH_INTERVAL)
+        _flush_chat_log()
+
+
+# The flusher starts lazily on first log line, not at import: gunicorn's
+# preload_app imports the app in the master, and fork() does not clone
+# threads, so a thread started here would exist in no worker.
+_chat_log_thread = None
+_chat_log_thread_lock = threading.Lock()
+
+
+def _ensure_chat_log_worker():
+    global _chat_log_thread
+    if _chat_log_thread is not None:
+        return
+    with _chat_log_thread_lock:
+        if _chat_log_thread is None:
+            _chat_log_thread = threading.Thread(
+                target=_chat_log_worker, name="chat-log-flusher", daemon=True
+            )
+            _chat_log_thread.start()
+
+
+def log_chat(business_id: str, user_message: str, reply_text: str):
+    _ensure_chat_log_worker()
+    with _chat_log_lock:
+        _chat_log_buf.append((time.time(), business_id, user_message, reply_text))
+        flush_now = len(_chat_log_buf) >= CHAT_LOG_FLUSH_THRESHOLD
+    if flush_now:
+        _flush_chat_log()
+
+
+atexit.register(_flush_chat_log)
+
+
+# Built once at import; /chat only pays a format_map per request instead of
+# re-assembling the multi-line f-string.
+SYSTEM_PROMPT_TEMPLATE = """
+You are a helpful, concise AI assistant for the business "{name}".
+
+You MUST follow these rules:
+- Answer ONLY using the data provided below (Hours, Services, Pricing, Location, Contact, FAQs, Booking URL).
+- If the answer is not clearly supported by this data, say you are not sure and ask the user to contact the business directly.
+- Do NOT invent prices, policies, availability, discounts, or guarantees.
+- Keep answers brief and clear (usually under 5 sentences) unless the user asks for more detail.
+- If the user asks about booking or making an appointment, direct them to the booking link or contact information.
+
+BUSINESS PROFILE
+----------------
+Name: {name}
+Location: {location}
+Address: {address}
+Contact: {contact}
+Booking URL: {booking_url}
+
+Hours:
+{hours}
+
+Services:
+{services}
+
+Pricing:
+{pricing}
+
+FAQs:
+{faqs}
+""".strip()
+
+
+def build_system_prompt(biz) -> str:
+    return SYSTEM_PROMPT_TEMPLATE.format_map(
+        {
+            "name": biz.name,
+            "location": biz.location,
+            "address": biz.address,
+            "contact": biz.contact,
+            "booking_url": biz.booking_url,
+            "hours": biz.hours,
+            "services": biz.services,
+            "pricing": biz.pricing,
+            "faqs": biz.faqs,
+        }
+    )
+
+
+# Rendered prompts ride along with the business cache: same TTL, same
+# invalidation, so /chat skips even the format_map on cache hits.
+_prompt_cache = {}
+
+
+def get_business(business_id: str):
+    now = time.monotonic()
+    with _business_cache_lock:
+        entry = _business_cache.get(business_id)
+        if entry and entry[0] > now:
+            return entry[1]
+
+    with db_session() as db:
+        biz = db.query(Business).filter(Business.business_id == business_id).first()
+
+    if biz is not None:  # never cache misses: a new signup must be visible
+        with _business_cache_lock:
+            _business_cache[business_id] = (now + BUSINESS_CACHE_TTL, biz)
+            _prompt_cache.pop(business_id, None)
+    return biz
+
+
+def get_system_prompt(biz) -> str:
+    with _business_cache_lock:
+        prompt = _prompt_cache.get(biz.business_id)
+    if prompt is None:
+        prompt = build_system_prompt(biz)
+        with _business_cache_lock:
+            _prompt_cache[biz.business_id] = prompt
+    return prompt
+
+
+def invalidate_business_cache(business_id: str):
+    with _business_cache_lock:
+        _business_cache.pop(business_id, None)
+        _prompt_cache.pop(business_id, None)
 
 
 def get_current_user():
+    # Memoized on flask.g: the auth decorator and the view body both call
+    # this, and one SELECT per request is enough.
+    cached = g.get("_current_user")
+    if cached is not None:
+        return cached
+
     user_id = session.get("user_id")
     if not user_id:
         return None, None, None
-    db = get_db()
-    try:
-        u = db.query(User).filter(User.id == user_id).first()
-        if not u:
-            return None, None, None
-        return u, u.role, u.business_id
-    finally:
-        db.close()
+    with db_session() as db:
+        u = db.get(User, user_id)
+    if not u:
+        return None, None, None
+    g._current_user = (u, u.role, u.business_id)
+    return g._current_user
+
+
+# How long the role/is_active copy in the signed session cookie is trusted
+# before we revalidate against the DB (so deactivations still take effect).
+AUTH_REFRESH_SECONDS = 60
+
+
+def get_session_auth():
+    """Return (user_id, role, business_id, is_active) for the current session.
+
+    Uses the itsdangerous-signed session payload when it is fresh, so plain
+    authorization checks cost an HMAC verify instead of a DB round-trip.
+    """
+    user_id = session.get("user_id")
+    if not user_id:
+        return None
+
+    checked_at = session.get("auth_checked_at")
+    if (
+        session.get("role") is not None
+        and checked_at
+        and time.time() - checked_at < AUTH_REFRESH_SECONDS
+    ):
+        return (
+            user_id,
+            session["role"],
+            session.get("business_id"),
+            session.get("is_active", True),
+        )
+
+    u, role, biz_id = get_current_user()
+    if not u:
+        session.clear()
+        return None
+    _store_session_auth(u)
+    return u.id, role, biz_id, bool(u.is_active)
+
+
+def _store_session_auth(user):
+    session["user_id"] = user.id
+    session["role"] = user.role
+    session["business_id"] = user.business_id
+    session["is_active"] = bool(user.is_active)
+    session["auth_checked_at"] = time.time()
 
 
 def login_required(f):
     @wraps(f)
     def wrapper(*args, **kwargs):
-        u, role, biz_id = get_current_user()
-        if not u:
+        if not get_session_auth():
             return redirect(url_for("login"))
         return f(*args, **kwargs)
 
@@ -132,8 +624,8 @@ def login_required(f):
 def admin_required(f):
     @wraps(f)
     def wrapper(*args, **kwargs):
-        u, role, biz_id = get_current_user()
-        if not u or role != "admin":
+        auth = get_session_auth()
+        if not auth or auth[1] != "admin":
             return redirect(url_for("login"))
         return f(*args, **kwargs)
 
@@ -143,10 +635,10 @@ def admin_required(f):
 def business_required(f):
     @wraps(f)
     def wrapper(*args, **kwargs):
-        u, role, biz_id = get_current_user()
-        if not u or role != "business":
+        auth = get_session_auth()
+        if not auth or auth[1] != "business":
             return redirect(url_for("login"))
-        if not u.is_active:
+        if not auth[3]:
             return "Your account is pending approval.", 403
         return f(*args, **kwargs)
 
@@ -161,25 +653,56 @@ def slugify_business_id(name: str) -> str:
         slug = "biz"
     base = slug[:32]
 
-    db = get_db()
-    try:
+    with db_session() as db:
         candidate = base
         i = 1
         while db.query(Business).filter(Business.business_id == candidate).first():
             i += 1
             candidate = f"{base}-{i}"
         return candidate
-    finally:
-        db.close()
 
 
-def send_email(to_email: str, subject: str, text_body: str):
+# Transient 429/5xx responses from either provider get retried at the
+# transport layer with exponential backoff (0.5s, 1s, 2s; Retry-After is
+# honored), so a momentary blip never surfaces as a user-facing error.
+_RETRY_POLICY = Retry(
+    total=3,
+    backoff_factor=0.5,
+    status_forcelist=(429, 500, 502, 503, 504),
+    allowed_methods=("POST",),
+    respect_retry_after_header=True,
+)
+
+# Shared session for outbound email API calls: keeps the TLS connection to
+# the provider alive across sends instead of handshaking per email.
+_email_session = requests.Session()
+_email_session.mount(
+    "https://",
+    requests.adapters.HTTPAdapter(
+        pool_connections=2, pool_maxsize=4, max_retries=_RETRY_POLICY
+    ),
+)
+
+# Keep-alive pool for OpenAI: every /chat turn reuses a warm TLS connection
+# instead of paying the TCP+TLS handshake to api.openai.com each time.
+_openai_session = requests.Session()
+_openai_session.mount(
+    "https://",
+    requests.adapters.HTTPAdapter(
+        pool_connections=20, pool_maxsize=50, max_retries=_RETRY_POLICY
+    ),
+)
+if OPENAI_API_KEY:
+    _openai_session.headers.update({"Authorization": f"Bearer {OPENAI_API_KEY}"})
+
+
+def _deliver_email(to_email: str, subject: str, text_body: str):
     if not RESEND_API_KEY or not EMAIL_FROM_ADDRESS:
         print("[EMAIL DISABLED]", subject, "->", to_email)
         print(text_body)
         return
     try:
-        resp = requests.post(
+        resp = _email_session.post(
             "https://api.resend.com/emails",
             headers={
                 "Authorization": f"Bearer {RESEND_API_KEY}",
@@ -199,11 +722,60 @@ def send_email(to_email: str, subject: str, text_body: str):
         print("[EMAIL EXCEPTION]", repr(e))
 
 
+# Emails are delivered from a single background thread so request handlers
+# never wait on the mail provider; the queue keeps sends ordered.
+_email_queue = queue.Queue()
+
+
+def _email_worker():
+    while True:
+        to_email, subject, text_body = _email_queue.get()
+        try:
+            _deliver_email(to_email, subject, text_body)
+        finally:
+            _email_queue.task_done()
+
+
+# Like the chat-log flusher, the worker starts lazily on first enqueue so
+# every forked gunicorn worker gets its own thread (fork() does not clone
+# threads started in the preloading master).
+_email_thread = None
+_email_thread_lock = threading.Lock()
+
+
+def _ensure_email_worker():
+    global _email_thread
+    if _email_thread is not None:
+        return
+    with _email_thread_lock:
+        if _email_thread is None:
+            _email_thread = threading.Thread(
+                target=_email_worker, name="email-worker", daemon=True
+            )
+            _email_thread.start()
+
+
+def send_email(to_email: str, subject: str, text_body: str):
+    _ensure_email_worker()
+    _email_queue.put((to_email, subject, text_body))
+
+
 def init_db():
     """Create tables and seed default admin + demo business if needed."""
     Base.metadata.create_all(engine)
-    db = get_db()
-    try:
+    # create_all won't add new indexes to tables that already exist.
+    with engine.connect() as conn:
+        conn.execute(
+            text("CREATE INDEX IF NOT EXISTS ix_users_business_id ON users (business_id)")
+        )
+        conn.execute(
+            text(
+                "CREATE INDEX IF NOT EXISTS ix_leads_business_created"
+                " ON leads (business_id, created_at)"
+            )
+        )
+        conn.commit()
+    with db_session() as db:
         # admin user
         admin = db.query(User).filter(User.role == "admin").first()
         if not admin:
@@ -211,12 +783,11 @@ def init_db():
             pw = ADMIN_PASSWORD or "changeme"
             admin = User(
                 email=email,
-                password_hash=generate_password_hash(pw),
+                password_hash=hash_password(pw),
                 role="admin",
                 is_active=True,
             )
             db.add(admin)
-            db.commit()
             print(f"[INIT] Created admin user {email} / {pw}")
 
         # demo business
@@ -237,9 +808,7 @@ def init_db():
                 category="barbershop",
             )
             db.add(demo)
-            db.commit()
-    finally:
-        db.close()
+        # db_session commits once on exit: one fsync for all seed rows.
 
 
 # ----------------- HTML templates -----------------
@@ -2473,11 +3042,7 @@ DASHBOARD_HTML = """
       <p>Paste this right before <code>&lt;/body&gt;</code> on your website.</p>
       <div class="code-block">
         <button class="copy-btn" onclick="copyCode()">Copy</button>
-        <code id="embedCode">&lt;iframe
-  src="{{ public_url }}?id={{ biz.business_id }}"
-  style="width:100%;max-width:420px;height:520px;border:none;border-radius:18px;box-shadow:0 20px 60px rgba(15,23,42,0.9);"
-  loading="lazy"
-&gt;&lt;/iframe&gt;</code>
+        <code id="embedCode">&lt;script async src="{{ public_url }}/widget.js?id={{ biz.business_id }}"&gt;&lt;/script&gt;</code>
       </div>
   </div>
 
@@ -2530,6 +3095,151 @@ DASHBOARD_HTML = """
 """
 
 
+CHAT_PAGE_CSS = """
+* { box-sizing: border-box; }
+body {
+  margin: 0;
+  min-height: 100vh;
+  font-family: system-ui, -apple-system, BlinkMacSystemFont, "SF Pro Text", sans-serif;
+  background: linear-gradient(180deg, #0a0a0f 0%, #020617 100%);
+  color: #e5e7eb;
+  display: flex;
+  align-items: center;
+  justify-content: center;
+  padding: 16px;
+}
+.shell {
+  width: 100%;
+  max-width: 420px;
+  background: rgba(15, 23, 42, 0.6);
+  backdrop-filter: blur(20px);
+  border-radius: 20px;
+  border: 1px solid rgba(148, 163, 184, 0.2);
+  padding: 0;
+  box-shadow: 0 20px 60px rgba(0, 0, 0, 0.5);
+  display: flex;
+  flex-direction: column;
+  height: 540px;
+  overflow: hidden;
+}
+.header {
+  padding: 16px 20px;
+  border-bottom: 1px solid rgba(148, 163, 184, 0.1);
+  display: flex;
+  align-items: center;
+  gap: 12px;
+  background: rgba(15, 23, 42, 0.4);
+}
+.avatar {
+  width: 40px;
+  height: 40px;
+  border-radius: 12px;
+  background: linear-gradient(135deg, #4f46e5, #6366f1);
+  display: flex;
+  align-items: center;
+  justify-content: center;
+  font-size: 20px;
+  flex-shrink: 0;
+}
+.header-info {
+  flex: 1;
+}
+.title {
+  font-size: 15px;
+  font-weight: 600;
+  margin-bottom: 2px;
+}
+.subtitle {
+  font-size: 12px;
+  color: #9ca3af;
+}
+.messages {
+  flex: 1;
+  overflow-y: auto;
+  padding: 20px;
+  display: flex;
+  flex-direction: column;
+  gap: 16px;
+  font-size: 14px;
+}
+.messages::-webkit-scrollbar {
+  width: 4px;
+}
+.messages::-webkit-scrollbar-thumb {
+  background: rgba(148, 163, 184, 0.2);
+  border-radius: 2px;
+}
+.msg {
+  display: flex;
+  gap: 8px;
+  max-width: 85%;
+}
+.msg.me {
+  align-self: flex-end;
+  flex-direction: row-reverse;
+}
+.bubble {
+  padding: 12px 16px;
+  border-radius: 16px;
+  line-height: 1.5;
+  word-wrap: break-word;
+}
+.msg:not(.me) .bubble {
+  background: rgba(148, 163, 184, 0.1);
+  border: 1px solid rgba(148, 163, 184, 0.15);
+}
+.msg.me .bubble {
+  background: linear-gradient(135deg, #4f46e5, #6366f1);
+  color: #f9fafb;
+}
+.input-row {
+  border-top: 1px solid rgba(148, 163, 184, 0.1);
+  padding: 16px 20px;
+  display: flex;
+  gap: 12px;
+  background: rgba(15, 23, 42, 0.4);
+}
+input {
+  flex: 1;
+  border-radius: 12px;
+  border: 1px solid rgba(148, 163, 184, 0.2);
+  background: rgba(2, 6, 23, 0.6);
+  color: #e5e7eb;
+  font-size: 14px;
+  padding: 12px 16px;
+  font-family: inherit;
+  transition: all 0.2s;
+}
+input:focus {
+  outline: none;
+  border-color: #6366f1;
+  box-shadow: 0 0 0 3px rgba(99, 102, 241, 0.1);
+}
+input::placeholder {
+  color: #6b7280;
+}
+button {
+  border-radius: 12px;
+  border: none;
+  padding: 12px 20px;
+  font-size: 14px;
+  font-weight: 500;
+  font-family: inherit;
+  cursor: pointer;
+  background: linear-gradient(135deg, #4f46e5, #6366f1);
+  color: #f9fafb;
+  transition: all 0.2s;
+}
+button:hover {
+  transform: translateY(-1px);
+  box-shadow: 0 4px 12px rgba(79, 70, 229, 0.4);
+}
+button:active {
+  transform: translateY(0);
+}
+"""
+
+
 CHAT_PAGE_HTML = """
 <!DOCTYPE html>
 <html>
@@ -2537,149 +3247,7 @@ CHAT_PAGE_HTML = """
   <meta charset="UTF-8" />
   <title>{{ biz.name }} · Chat</title>
   <meta name="viewport" content="width=device-width, initial-scale=1" />
-  <style>
-    * { box-sizing: border-box; }
-    body {
-      margin: 0;
-      min-height: 100vh;
-      font-family: system-ui, -apple-system, BlinkMacSystemFont, "SF Pro Text", sans-serif;
-      background: linear-gradient(180deg, #0a0a0f 0%, #020617 100%);
-      color: #e5e7eb;
-      display: flex;
-      align-items: center;
-      justify-content: center;
-      padding: 16px;
-    }
-    .shell {
-      width: 100%;
-      max-width: 420px;
-      background: rgba(15, 23, 42, 0.6);
-      backdrop-filter: blur(20px);
-      border-radius: 20px;
-      border: 1px solid rgba(148, 163, 184, 0.2);
-      padding: 0;
-      box-shadow: 0 20px 60px rgba(0, 0, 0, 0.5);
-      display: flex;
-      flex-direction: column;
-      height: 540px;
-      overflow: hidden;
-    }
-    .header {
-      padding: 16px 20px;
-      border-bottom: 1px solid rgba(148, 163, 184, 0.1);
-      display: flex;
-      align-items: center;
-      gap: 12px;
-      background: rgba(15, 23, 42, 0.4);
-    }
-    .avatar {
-      width: 40px;
-      height: 40px;
-      border-radius: 12px;
-      background: linear-gradient(135deg, #4f46e5, #6366f1);
-      display: flex;
-      align-items: center;
-      justify-content: center;
-      font-size: 20px;
-      flex-shrink: 0;
-    }
-    .header-info {
-      flex: 1;
-    }
-    .title {
-      font-size: 15px;
-      font-weight: 600;
-      margin-bottom: 2px;
-    }
-    .subtitle {
-      font-size: 12px;
-      color: #9ca3af;
-    }
-    .messages {
-      flex: 1;
-      overflow-y: auto;
-      padding: 20px;
-      display: flex;
-      flex-direction: column;
-      gap: 16px;
-      font-size: 14px;
-    }
-    .messages::-webkit-scrollbar {
-      width: 4px;
-    }
-    .messages::-webkit-scrollbar-thumb {
-      background: rgba(148, 163, 184, 0.2);
-      border-radius: 2px;
-    }
-    .msg {
-      display: flex;
-      gap: 8px;
-      max-width: 85%;
-    }
-    .msg.me {
-      align-self: flex-end;
-      flex-direction: row-reverse;
-    }
-    .bubble {
-      padding: 12px 16px;
-      border-radius: 16px;
-      line-height: 1.5;
-      word-wrap: break-word;
-    }
-    .msg:not(.me) .bubble {
-      background: rgba(148, 163, 184, 0.1);
-      border: 1px solid rgba(148, 163, 184, 0.15);
-    }
-    .msg.me .bubble {
-      background: linear-gradient(135deg, #4f46e5, #6366f1);
-      color: #f9fafb;
-    }
-    .input-row {
-      border-top: 1px solid rgba(148, 163, 184, 0.1);
-      padding: 16px 20px;
-      display: flex;
-      gap: 12px;
-      background: rgba(15, 23, 42, 0.4);
-    }
-    input {
-      flex: 1;
-      border-radius: 12px;
-      border: 1px solid rgba(148, 163, 184, 0.2);
-      background: rgba(2, 6, 23, 0.6);
-      color: #e5e7eb;
-      font-size: 14px;
-      padding: 12px 16px;
-      font-family: inherit;
-      transition: all 0.2s;
-    }
-    input:focus {
-      outline: none;
-      border-color: #6366f1;
-      box-shadow: 0 0 0 3px rgba(99, 102, 241, 0.1);
-    }
-    input::placeholder {
-      color: #6b7280;
-    }
-    button {
-      border-radius: 12px;
-      border: none;
-      padding: 12px 20px;
-      font-size: 14px;
-      font-weight: 500;
-      font-family: inherit;
-      cursor: pointer;
-      background: linear-gradient(135deg, #4f46e5, #6366f1);
-      color: #f9fafb;
-      transition: all 0.2s;
-    }
-    button:hover {
-      transform: translateY(-1px);
-      box-shadow: 0 4px 12px rgba(79, 70, 229, 0.4);
-    }
-    button:active {
-      transform: translateY(0);
-    }
-  </style>
+  <link rel="stylesheet" href="/chat.css" />
 </head>
 <body>
   <div class="shell">
@@ -2715,6 +3283,7 @@ CHAT_PAGE_HTML = """
       wrapper.appendChild(bubble);
       messagesEl.appendChild(wrapper);
       messagesEl.scrollTop = messagesEl.scrollHeight;
+      return bubble;
     }
 
     async function send() {
@@ -2725,13 +3294,36 @@ CHAT_PAGE_HTML = """
       sendBtn.disabled = true;
       sendBtn.textContent = "Sending...";
       try {
-        const resp = await fetch("/chat", {
+        const resp = await fetch("/chat/stream", {
           method: "POST",
           headers: {"Content-Type": "application/json"},
           body: JSON.stringify({ business_id: bizId, message: text })
         });
-        const data = await resp.json();
-        addMessage(data.reply || "Sorry, something went wrong.");
+        if (!resp.ok || !resp.body) {
+          const data = await resp.json();
+          addMessage(data.reply || "Sorry, something went wrong.");
+          return;
+        }
+        const bubble = addMessage("");
+        const reader = resp.body.getReader();
+        const decoder = new TextDecoder();
+        let buf = "";
+        for (;;) {
+          const { value, done } = await reader.read();
+          if (done) break;
+          buf += decoder.decode(value, { stream: true });
+          const frames = buf.split("\\n\\n");
+          buf = frames.pop();
+          for (const frame of frames) {
+            if (frame.startsWith("data: ")) {
+              bubble.textContent += JSON.parse(frame.slice(6));
+              messagesEl.scrollTop = messagesEl.scrollHeight;
+            }
+          }
+        }
+        if (!bubble.textContent) {
+          bubble.textContent = "Sorry, I couldn't generate a reply.";
+        }
       } catch (e) {
         addMessage("Sorry, something went wrong.");
       } finally {
@@ -2838,27 +3430,118 @@ ADMIN_BUSINESSES_HTML = """
 """
 
 
+WIDGET_JS = """
+(function() {
+  var script = document.currentScript;
+  if (!script) return;
+  var match = /[?&]id=([^&]+)/.exec(script.src);
+  var bizId = match ? decodeURIComponent(match[1]) : "demo";
+  var base = script.src.split("/widget.js")[0];
+
+  var btn = document.createElement("button");
+  btn.textContent = "\\ud83d\\udcac";
+  btn.setAttribute("aria-label", "Open chat");
+  btn.style.cssText = "position:fixed;bottom:20px;right:20px;width:56px;height:56px;border-radius:50%;border:none;cursor:pointer;font-size:24px;background:linear-gradient(135deg,#4f46e5,#6366f1);color:#fff;box-shadow:0 8px 24px rgba(79,70,229,0.5);z-index:999998;";
+
+  var frame = document.createElement("iframe");
+  frame.src = base + "/?id=" + encodeURIComponent(bizId);
+  frame.loading = "lazy";
+  frame.style.cssText = "position:fixed;bottom:88px;right:20px;width:380px;max-width:calc(100vw - 40px);height:520px;border:none;border-radius:18px;box-shadow:0 20px 60px rgba(15,23,42,0.9);z-index:999999;display:none;";
+
+  btn.addEventListener("click", function() {
+    var open = frame.style.display !== "none";
+    frame.style.display = open ? "none" : "block";
+    btn.textContent = open ? "\\ud83d\\udcac" : "\\u2715";
+  });
+
+  document.body.appendChild(frame);
+  document.body.appendChild(btn);
+})();
+""".strip()
+
+# The loader derives its own base URL from the script tag's src, so one
+# byte-identical (and pre-gzipped) copy serves every host and can be cached
+# by any reverse proxy or CDN in front of the app.
+WIDGET_JS_BYTES = WIDGET_JS.encode("utf-8")
+WIDGET_JS_GZIP = gzip.compress(WIDGET_JS_BYTES, 9)
+WIDGET_JS_ETAG = hashlib.md5(WIDGET_JS_BYTES).hexdigest()
+
+
 # ----------------- Routes -----------------
 
+# render_template_string re-lexes and recompiles its input on every call;
+# these page templates are module constants, so compile each one exactly
+# once and reuse the compiled jinja2.Template.
+_compiled_templates = {}
+
+
+def render_page(template_str, **context):
+    tpl = _compiled_templates.get(id(template_str))
+    if tpl is None:
+        tpl = app.jinja_env.from_string(template_str)
+        _compiled_templates[id(template_str)] = tpl
+    return tpl.render(**context)
+
+
+# The landing and pricing pages have no per-request data, so render them
+# once per process instead of running Jinja on every hit.
+_static_page_cache = {}
+
+
+def _render_static_page(name, template):
+    html = _static_page_cache.get(name)
+    if html is None:
+        html = render_page(template)
+        _static_page_cache[name] = html
+    return html
+
 
 @app.route("/")
 def index():
     business_id = (request.args.get("id") or "").strip()
     if business_id:
-        db = get_db()
-        try:
-            biz = db.query(Business).filter(Business.business_id == business_id).first()
-        finally:
-            db.close()
+        biz = get_business(business_id)
         if not biz:
             return "Business not found.", 404
-        return render_template_string(CHAT_PAGE_HTML, biz=biz)
-    return render_template_string(LANDING_HTML)
+        return render_page(CHAT_PAGE_HTML, biz=biz)
+    return _render_static_page("landing", LANDING_HTML)
 
 
 @app.route("/pricing")
 def pricing():
-    return render_template_string(PRICING_HTML)
+    return _render_static_page("pricing", PRICING_HTML)
+
+
+# The chat page ships on every widget load; its stylesheet never changes per
+# request, so serve it as a separate asset the browser caches once.
+CHAT_PAGE_CSS_BYTES = CHAT_PAGE_CSS.encode("utf-8")
+CHAT_PAGE_CSS_ETAG = hashlib.md5(CHAT_PAGE_CSS_BYTES).hexdigest()
+
+
+@app.route("/chat.css")
+def chat_css():
+    if request.if_none_match.contains(CHAT_PAGE_CSS_ETAG):
+        return Response(status=304)
+    resp = Response(CHAT_PAGE_CSS_BYTES, mimetype="text/css")
+    resp.headers["Cache-Control"] = "public, max-age=86400"
+    resp.headers["ETag"] = CHAT_PAGE_CSS_ETAG
+    return resp
+
+
+@app.route("/widget.js")
+def widget_js():
+    if request.if_none_match.contains(WIDGET_JS_ETAG):
+        return Response(status=304)
+
+    if "gzip" in (request.headers.get("Accept-Encoding") or ""):
+        resp = Response(WIDGET_JS_GZIP, mimetype="application/javascript")
+        resp.headers["Content-Encoding"] = "gzip"
+    else:
+        resp = Response(WIDGET_JS_BYTES, mimetype="application/javascript")
+    resp.headers["Cache-Control"] = "public, max-age=86400"
+    resp.headers["ETag"] = WIDGET_JS_ETAG
+    resp.headers["Vary"] = "Accept-Encoding"
+    return resp
 
 
 @app.route("/signup", methods=["GET", "POST"])
@@ -2883,8 +3566,7 @@ def signup():
             message = "Name, email, password, and business name are required."
             error = True
         else:
-            db = get_db()
-            try:
+            with db_session() as db:
                 existing = db.query(User).filter(User.email == email).first()
                 if existing:
                     message = "An account with this email already exists."
@@ -2906,7 +3588,7 @@ def signup():
 
                     user = User(
                         email=email,
-                        password_hash=generate_password_hash(password),
+                        password_hash=hash_password(password),
                         role="business",
                         business_id=biz_id,
                         is_active=False,  # require admin approval
@@ -2932,10 +3614,8 @@ def signup():
                             "Log into the admin panel to review and approve this account."
                         )
                         send_email(ADMIN_EMAIL, subject, body)
-            finally:
-                db.close()
 
-    return render_template_string(SIGNUP_HTML, message=message, error=error, plan=plan)
+    return render_page(SIGNUP_HTML, message=message, error=error, plan=plan)
 
 
 @app.route("/login", methods=["GET", "POST"])
@@ -2945,24 +3625,21 @@ def login():
         email = (request.form.get("email") or "").strip().lower()
         password = request.form.get("password") or ""
 
-        db = get_db()
-        try:
+        with db_session() as db:
             user = db.query(User).filter(User.email == email).first()
-        finally:
-            db.close()
 
-        if not user or not check_password_hash(user.password_hash, password):
+        if not user or not check_login_password(user, password):
             error = "Invalid email or password."
         elif user.role == "business" and not user.is_active:
             error = "Your account is pending approval."
         else:
-            session["user_id"] = user.id
+            _store_session_auth(user)
             if user.role == "admin":
                 return redirect(url_for("admin_businesses"))
             else:
                 return redirect(url_for("dashboard"))
 
-    return render_template_string(LOGIN_HTML, error=error)
+    return render_page(LOGIN_HTML, error=error)
 
 
 @app.route("/logout")
@@ -2976,8 +3653,7 @@ def forgot_password():
     message = None
     if request.method == "POST":
         email = (request.form.get("email") or "").strip().lower()
-        db = get_db()
-        try:
+        with db_session() as db:
             user = db.query(User).filter(User.email == email).first()
             if user:
                 token = secrets.token_urlsafe(48)
@@ -2996,21 +3672,18 @@ def forgot_password():
                     "This link will expire in 1 hour. If you didn't request this, you can ignore this email."
                 )
                 send_email(user.email, subject, body)
-        finally:
-            db.close()
         message = "If an account exists for that email, you'll receive a reset link shortly."
 
-    return render_template_string(FORGOT_PASSWORD_HTML, message=message)
+    return render_page(FORGOT_PASSWORD_HTML, message=message)
 
 
 @app.route("/reset-password", methods=["GET", "POST"])
 def reset_password():
     token = (request.args.get("token") or "").strip()
     if not token:
-        return render_template_string(RESET_PASSWORD_HTML, message="Invalid link.", error=True, valid=False)
+        return render_page(RESET_PASSWORD_HTML, message="Invalid link.", error=True, valid=False)
 
-    db = get_db()
-    try:
+    with db_session() as db:
         user = db.query(User).filter(User.reset_token == token).first()
         now = datetime.datetime.utcnow()
         valid = bool(user and user.reset_expires_at and user.reset_expires_at > now)
@@ -3024,14 +3697,15 @@ def reset_password():
                 message = "Password cannot be empty."
                 error = True
             else:
-                user.password_hash = generate_password_hash(password)
+                user.password_hash = hash_password(password)
                 user.reset_token = None
                 user.reset_expires_at = None
                 db.commit()
+                invalidate_login_cache(user.id)
                 message = "Your password has been updated. You can now log in."
                 error = False
                 valid = False  # hide form after success
-                return render_template_string(
+                return render_page(
                     RESET_PASSWORD_HTML,
                     message=message,
                     error=error,
@@ -3042,17 +3716,14 @@ def reset_password():
             message = "This reset link is invalid or has expired."
             error = True
 
-        return render_template_string(RESET_PASSWORD_HTML, message=message, error=error, valid=valid)
-    finally:
-        db.close()
+        return render_page(RESET_PASSWORD_HTML, message=message, error=error, valid=valid)
 
 
 @app.route("/dashboard")
 @business_required
 def dashboard():
     user, role, business_id = get_current_user()
-    db = get_db()
-    try:
+    with db_session() as db:
         biz = db.query(Business).filter(Business.business_id == business_id).first()
         leads = (
             db.query(Lead)
@@ -3061,36 +3732,38 @@ def dashboard():
             .limit(50)
             .all()
         )
-    finally:
-        db.close()
 
     public_url = request.url_root.rstrip("/")
-    return render_template_string(DASHBOARD_HTML, biz=biz, leads=leads, public_url=public_url)
+    return render_page(DASHBOARD_HTML, biz=biz, leads=leads, public_url=public_url)
 
 
 @app.route("/admin/businesses")
 @admin_required
 def admin_businesses():
-    db = get_db()
-    try:
+    with db_session() as db:
         users = db.query(User).filter(User.role == "business").all()
-        rows = []
-        for u in users:
-            biz = db.query(Business).filter(Business.business_id == u.business_id).first()
-            if biz:
-                rows.append({"user": u, "business": biz})
+        biz_ids = [u.business_id for u in users if u.business_id]
+        businesses = {}
+        if biz_ids:
+            # One IN query instead of a Business lookup per user.
+            for biz in (
+                db.query(Business).filter(Business.business_id.in_(biz_ids)).all()
+            ):
+                businesses[biz.business_id] = biz
+        rows = [
+            {"user": u, "business": businesses[u.business_id]}
+            for u in users
+            if u.business_id in businesses
+        ]
         rows.sort(key=lambda r: (r["user"].is_active, r["business"].name))
-    finally:
-        db.close()
-    return render_template_string(ADMIN_BUSINESSES_HTML, rows=rows)
+    return render_page(ADMIN_BUSINESSES_HTML, rows=rows)
 
 
 @app.route("/admin/approve/<int:user_id>")
 @admin_required
 def admin_approve(user_id):
-    db = get_db()
-    try:
-        u = db.query(User).filter(User.id == user_id).first()
+    with db_session() as db:
+        u = db.get(User, user_id)
         if not u:
             return "User not found", 404
         u.is_active = True
@@ -3103,23 +3776,18 @@ def admin_approve(user_id):
             "Login here: /login"
         )
         send_email(u.email, subject, body)
-    finally:
-        db.close()
     return redirect(url_for("admin_businesses"))
 
 
 @app.route("/admin/deactivate/<int:user_id>")
 @admin_required
 def admin_deactivate(user_id):
-    db = get_db()
-    try:
-        u = db.query(User).filter(User.id == user_id).first()
+    with db_session() as db:
+        u = db.get(User, user_id)
         if not u:
             return "User not found", 404
         u.is_active = False
         db.commit()
-    finally:
-        db.close()
     return redirect(url_for("admin_businesses"))
 
 
@@ -3133,80 +3801,24 @@ def chat():
         if not business_id or not user_message:
             return jsonify({"reply": "Missing business_id or message."}), 400
 
-        db = get_db()
-        try:
-            biz = db.query(Business).filter(Business.business_id == business_id).first()
-        finally:
-            db.close()
-
+        biz = get_business(business_id)
         if not biz:
             return jsonify({"reply": "Business not found."}), 404
 
-        system_prompt = f"""
-You are a helpful, concise AI assistant for the business "{biz.name}".
+        system_prompt = get_system_prompt(biz)
 
-You MUST follow these rules:
-- Answer ONLY using the data provided below (Hours, Services, Pricing, Location, Contact, FAQs, Booking URL).
-- If the answer is not clearly supported by this data, say you are not sure and ask the user to contact the business directly.
-- Do NOT invent prices, policies, availability, discounts, or guarantees.
-- Keep answers brief and clear (usually under 5 sentences) unless the user asks for more detail.
-- If the user asks about booking or making an appointment, direct them to the booking link or contact information.
-
-BUSINESS PROFILE
-----------------
-Name: {biz.name}
-Location: {biz.location}
-Address: {biz.address}
-Contact: {biz.contact}
-Booking URL: {biz.booking_url}
-
-Hours:
-{biz.hours}
-
-Services:
-{biz.services}
-
-Pricing:
-{biz.pricing}
-
-FAQs:
-{biz.faqs}
-""".strip()
+        norm_message = _normalize_message(user_message)
 
         if not OPENAI_API_KEY:
             reply_text = "AI is not configured yet."
         else:
-            resp = requests.post(
-                "https://api.openai.com/v1/chat/completions",
-                headers={
-                    "Authorization": f"Bearer {OPENAI_API_KEY}",
-                    "Content-Type": "application/json",
-                },
-                json={
-                    "model": "gpt-4o-mini",
-                    "messages": [
-                        {"role": "system", "content": system_prompt},
-                        {"role": "user", "content": user_message},
-                    ],
-                    "temperature": 0.3,
-                },
-                timeout=60,
-            )
-            resp.raise_for_status()
-            data_json = resp.json()
-            reply_text = (
-                data_json.get("choices", [{}])[0]
-                .get("message", {})
-                .get("content", "")
-                .strip()
+            reply_text = get_chat_reply(
+                business_id, norm_message, system_prompt, user_message
             )
             if not reply_text:
                 reply_text = "Sorry, I couldn't generate a reply."
 
-        ts = datetime.datetime.now().isoformat()
-        log_line = f"{ts} | {business_id} | USER: {user_message} | BOT: {reply_text}\n"
-        with open(CHAT_LOG_FILE, "a") as logf:
-            logf.write(log_line)
+        log_chat(business_id, user_message, reply_text)
 
         return jsonify({"reply": reply_text})
     except Exception as e:
@@ -3214,6 +3826,100 @@ FAQs:
         return jsonify({"reply": "Sorry, something went wrong with the AI."}), 500
 
 
+def _sse_event(piece: str) -> str:
+    return "data: " + json.dumps(piece) + "\n\n"
+
+
+@app.route("/chat/stream", methods=["POST"])
+def chat_stream():
+    """Like /chat, but relays reply tokens over SSE as OpenAI emits them.
+
+    Time-to-first-token becomes model latency instead of end-to-end
+    completion time; the buffered /chat endpoint stays for embedders that
+    expect a single JSON body.
+    """
+    data = request.get_json(force=True)
+    business_id = (data.get("business_id") or "").strip()
+    user_message = (data.get("message") or "").strip()
+
+    if not business_id or not user_message:
+        return jsonify({"reply": "Missing business_id or message."}), 400
+
+    biz = get_business(business_id)
+    if not biz:
+        return jsonify({"reply": "Business not found."}), 404
+
+    system_prompt = get_system_prompt(biz)
+    norm_message = _normalize_message(user_message)
+
+    def generate():
+        if not OPENAI_API_KEY:
+            reply = "AI is not configured yet."
+            yield _sse_event(reply)
+            log_chat(business_id, user_message, reply)
+            return
+
+        cached = get_cached_reply(business_id, norm_message)
+        if cached is not None:
+            yield _sse_event(cached)
+            log_chat(business_id, user_message, cached)
+            return
+
+        # Same single-flight protocol as get_chat_reply: followers wait for
+        # the leader's cached reply and emit it as one frame rather than
+        # opening a duplicate OpenAI stream for the same question.
+        key = (business_id, norm_message)
+        with _inflight_lock:
+            leader_event = _inflight.get(key)
+            if leader_event is None:
+                _inflight[key] = threading.Event()
+
+        if leader_event is not None:
+            leader_event.wait(timeout=30)
+            cached = get_cached_reply(business_id, norm_message)
+            if cached is not None:
+                yield _sse_event(cached)
+                log_chat(business_id, user_message, cached)
+                return
+            # The leader failed or cached nothing; fall through and stream
+            # our own reply (without touching the leader's map entry).
+
+        parts = []
+        complete = False
+        try:
+            try:
+                for delta in _stream_openai_reply(system_prompt, user_message):
+                    parts.append(delta)
+                    yield _sse_event(delta)
+                complete = True
+            except Exception as e:
+                print("ERROR in /chat/stream:", repr(e))
+                if not parts:
+                    reply = "Sorry, something went wrong with the AI."
+                    yield _sse_event(reply)
+                    log_chat(business_id, user_message, reply)
+                    return
+
+            reply = "".join(parts).strip()
+            # A stream that died mid-reply leaves a truncated answer; log it
+            # for the transcript but never cache it for later visitors.
+            if complete and reply:
+                cache_reply(business_id, norm_message, reply)
+            log_chat(business_id, user_message, reply or "(empty reply)")
+        finally:
+            if leader_event is None:
+                with _inflight_lock:
+                    done_event = _inflight.pop(key, None)
+                if done_event is not None:
+                    done_event.set()
+
+    resp = Response(generate(), mimetype="text/event-stream")
+    resp.headers["Cache-Control"] = "no-cache"
+    # Tell buffering proxies (nginx) to pass events through immediately.
+    resp.headers["X-Accel-Buffering"] = "no"
+    return resp
+
+
 @app.route("/lead", methods=["POST"])
 def lead():
     data = request.get_json(force=True)
@@ -3226,12 +3932,11 @@ def lead():
     if not business_id or not email:
         return jsonify({"ok": False, "error": "Missing business_id or email."}), 400
 
-    db = get_db()
-    try:
-        biz = db.query(Business).filter(Business.business_id == business_id).first()
-        if not biz:
-            return jsonify({"ok": False, "error": "Business not found."}), 404
+    biz = get_business(business_id)
+    if not biz:
+        return jsonify({"ok": False, "error": "Business not found."}), 404
 
+    with db_session() as db:
         lead_obj = Lead(
             business_id=business_id,
             name=name,
@@ -3242,34 +3947,51 @@ def lead():
         db.add(lead_obj)
         db.commit()
 
-        subject = f"New lead from {biz.name}"
-        body = (
-            f"You received a new lead from your NovuChat widget.\n\n"
-            f"Name: {name}\n"
-            f"Email: {email}\n"
-            f"Phone: {phone}\n\n"
-            f"Message:\n{message}\n\n"
-        )
-        if biz.contact:
-            contact_email = None
-            for token in biz.contact.replace(",", " ").split():
-                if "@" in token:
-                    contact_email = token.strip()
-                    break
-            if contact_email:
-                send_email(contact_email, subject, body)
-        if ADMIN_EMAIL:
-            send_email(ADMIN_EMAIL, "[Copy] " + subject, body)
-
-    finally:
-        db.close()
+    biz_name = biz.name
+    biz_contact = biz.contact or ""
+
+    # Email dispatch happens after the DB session is released so a slow
+    # mail provider never pins a connection from the pool.
+    subject = f"New lead from {biz_name}"
+    body = (
+        f"You received a new lead from your NovuChat widget.\n\n"
+        f"Name: {name}\n"
+        f"Email: {email}\n"
+        f"Phone: {phone}\n\n"
+        f"Message:\n{message}\n\n"
+    )
+    if biz_contact:
+        contact_email = None
+        for token in biz_contact.replace(",", " ").split():
+            if "@" in token:
+                contact_email = token.strip()
+                break
+        if contact_email:
+            send_email(contact_email, subject, body)
+    if ADMIN_EMAIL:
+        send_email(ADMIN_EMAIL, "[Copy] " + subject, body)
 
     return jsonify({"ok": True})
 
 
 # ----------------- Startup -----------------
 
-init_db()
+
+@app.cli.command("init-db")
+def init_db_command():
+    """Create tables and seed the default admin + demo business."""
+    init_db()
+    print("[INIT] Database ready.")
+
 
 if __name__ == "__main__":
-    app.run(host="0.0.0.0", port=int(os.getenv("PORT", "5000")), debug=True)
+    # Dev convenience only; deployments run `flask --app app init-db` once
+    # and serve via `gunicorn -c gunicorn.conf.py app:app`. The debugger and
+    # reloader stat every imported module per request, so they stay off
+    # unless explicitly requested.
+    init_db()
+    app.run(
+        host="0.0.0.0",
+        port=int(os.getenv("PORT", "5000")),
+        debug=os.getenv("FLASK_DEBUG") == "1",
+    )
@@ -0,0 +1,18 @@
+"""Gunicorn config: run with `gunicorn -c gunicorn.conf.py app:app`.
+
+Run `flask --app app init-db` once beforehand; workers don't touch the
+schema at import time.
+"""
+
+import os
+
+bind = "0.0.0.0:" + os.getenv("PORT", "5000")
+workers = int(os.getenv("WEB_CONCURRENCY", str((os.cpu_count() or 1) * 2 + 1)))
+worker_class = os.getenv("GUNICORN_WORKER_CLASS", "gthread")
+threads = int(os.getenv("GUNICORN_THREADS", "8"))
+worker_connections = 1000
+keepalive = 5
+# Safe to preload: the app's background threads (email worker, chat-log
+# flusher) start lazily on first use inside each worker, not at import in
+# the master, so fork() stranding them is not a concern.
+preload_app = True